@@ -6,6 +6,7 @@
 .. moduleauthor:: Andrea Cervesato <andrea.cervesato@suse.com>
 """
 import os
+import signal
 import subprocess
 import logging
 from .base import Backend
@@ -36,17 +37,42 @@ class ShellBackend(Backend):
     def start(self) -> None:
         pass
 
-    def stop(self, _: int = 0) -> None:
-        if not self._process:
+    @staticmethod
+    def _kill_group(proc: subprocess.Popen, sig: int) -> None:
+        """
+        Send a signal to the command and to all of its children. Commands
+        are executed in a new session, so process group ID is the same of
+        the process ID.
+        """
+        # once the process has been reaped, its ID can be reused by an
+        # unrelated process group
+        if proc.poll() is not None:
+            return
+
+        try:
+            os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def stop(self, timeout: int = 0) -> None:
+        proc = self._process
+        if not proc:
             raise BackendError("No process running")
 
-        self._process.terminate()
+        self._kill_group(proc, signal.SIGTERM)
+
+        try:
+            proc.wait(timeout=timeout if timeout > 0 else None)
+        except subprocess.TimeoutExpired as err:
+            raise BackendError("Process timed out during stop") from err
 
     def force_stop(self) -> None:
-        if not self._process:
+        proc = self._process
+        if not proc:
             raise BackendError("No process running")
 
-        self._process.kill()
+        self._kill_group(proc, signal.SIGKILL)
+        proc.wait()
 
     def _run_cmd_impl(self, command: str, timeout: int) -> dict:
         if self._process:
@@ -61,9 +87,6 @@ class ShellBackend(Backend):
 
         self._logger.info("Executing '%s' (timeout=%d)", command, timeout)
 
-        # keep usage of preexec_fn trivial
-        # see warnings in https://docs.python.org/3/library/subprocess.html
-        # pylint: disable=subprocess-popen-preexec-fn
         # pylint: disable=consider-using-with
         self._process = subprocess.Popen(
             command,
@@ -73,7 +96,7 @@ class ShellBackend(Backend):
             env=self._env,
             shell=True,
             universal_newlines=True,
-            preexec_fn=os.setsid)
+            start_new_session=True)
 
         ret = None
         try:
@@ -88,7 +111,9 @@ class ShellBackend(Backend):
             }
             self._logger.debug("return data=%s", ret)
         except subprocess.TimeoutExpired as err:
-            self._process.kill()
+            self._kill_group(self._process, signal.SIGKILL)
+            # wait until the whole group released stdout and reap the shell
+            self._process.communicate()
             raise BackendError from err
         finally:
             self._process = None
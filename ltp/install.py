@@ -5,6 +5,7 @@
 
 .. moduleauthor:: Andrea Cervesato <andrea.cervesato@suse.com>
 """
+import shlex
 import logging
 import subprocess
 import argparse
@@ -108,7 +109,8 @@ class Installer:
         Run LTP installation from Git repository.
         """
         self._logger.info("Cloning repository..")
-        self._run_cmd(f"git clone --depth=1 {url} {repo_dir}")
+        self._run_cmd(
+            f"git clone --depth=1 {shlex.quote(url)} {shlex.quote(repo_dir)}")
         self._logger.info("Cloning completed")
 
     def _install_from_src(self, repo_dir: str, install_dir: str) -> None:
@@ -121,7 +123,8 @@ class Installer:
             ['getconf', '_NPROCESSORS_ONLN']).rstrip().decode("utf-8")
 
         self._run_cmd("make autotools", repo_dir)
-        self._run_cmd("./configure --prefix=" + install_dir, repo_dir)
+        self._run_cmd(
+            "./configure --prefix=" + shlex.quote(install_dir), repo_dir)
         self._run_cmd(f"make -j{cpus}", repo_dir)
         self._run_cmd("make install", repo_dir)
 
@@ -259,6 +262,10 @@ class DebianInstaller(Installer):
     Installer for Debian.
     """
 
+    def __init__(self) -> None:
+        super().__init__()
+        self._arch = None
+
     @property
     def distro_id(self) -> str:
         return "debian"
@@ -299,9 +306,11 @@ class DebianInstaller(Installer):
             "xfsprogs",
         ]
 
-        arch = subprocess.check_output(
-            ['dpkg', '--print-architecture']).rstrip().decode("utf-8")
-        pkgs.append(f"linux-headers-{arch}")
+        if not self._arch:
+            self._arch = subprocess.check_output(
+                ['dpkg', '--print-architecture']).rstrip().decode("utf-8")
+
+        pkgs.append(f"linux-headers-{self._arch}")
 
         return pkgs
 
@@ -484,6 +493,8 @@ INSTALLERS = [
     FedoraInstaller(),
 ]
 
+SUPPORTED_DISTROS = tuple(pm.distro_id for pm in INSTALLERS)
+
 
 def get_distro() -> str:
     """
@@ -541,26 +552,20 @@ def install_run(args: Namespace) -> None:
         distro_id = args.distro if args.distro else None
         installer = get_installer(distro_id)
 
-        msg = ""
-        if args.cmd:
-            msg += installer.refresh_cmd
-            msg += " && "
-            msg += installer.install_cmd
-            msg += " "
-
+        pkgs = []
         if args.build:
-            pkgs = installer.get_build_pkgs(args.m32)
-            msg += " ".join(pkgs)
-            pkgs = installer.get_libs_pkgs(args.m32)
-            msg += " ".join(pkgs)
+            pkgs.extend(installer.get_build_pkgs(args.m32))
+            pkgs.extend(installer.get_libs_pkgs(args.m32))
 
         if args.runtime:
-            pkgs = installer.get_runtime_pkgs(args.m32)
-            msg += " ".join(pkgs)
+            pkgs.extend(installer.get_runtime_pkgs(args.m32))
 
         if args.tools:
-            pkgs = installer.get_tools_pkgs()
-            msg += " ".join(pkgs)
+            pkgs.extend(installer.get_tools_pkgs())
+
+        msg = " ".join(pkgs)
+        if args.cmd:
+            msg = f"{installer.refresh_cmd} && {installer.install_cmd} {msg}"
 
         print(msg)
     except InstallerError as err:
@@ -600,14 +605,16 @@ def init_cmdline(parser: argparse.ArgumentParser) -> None:
         help="Print command line instead of package list")
 
 
-def main():
+def main(argv: list = None) -> None:
     """
     Main point for the install script.
+    :param argv: command line arguments. If None, sys.argv is used
+    :type argv: list
     """
     parser = argparse.ArgumentParser(description='LTP packages tool')
     init_cmdline(parser)
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if hasattr(args, "func"):
         args.func(args)
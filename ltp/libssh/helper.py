@@ -42,6 +42,9 @@ from ltp.libssh.channel import (
     ssh_channel_get_exit_status
 )
 
+# size of the buffer used to read remote commands output
+READ_BUFFER_SIZE = 128 * 1024
+
 
 class SSHError(Exception):
     """
@@ -276,9 +279,9 @@ class SSHClient:
         if ret != SSH_OK:
             raise_error(True)
 
-        stdout = ""
+        stdout = bytearray()
         nbytes = 1
-        buffsize = 1024
+        buffsize = READ_BUFFER_SIZE
         data = ctypes.create_string_buffer(buffsize)
 
         while nbytes > 0:
@@ -292,7 +295,7 @@ class SSHClient:
             if nbytes < 0:
                 raise_error(True)
 
-            stdout += data.value[:nbytes].decode("utf-8")
+            stdout += data[:nbytes]
 
         exit_status = ssh_channel_get_exit_status(c_channel)
 
@@ -301,4 +304,4 @@ class SSHClient:
 
         self._logger.info("Command executed")
 
-        return exit_status, stdout
+        return exit_status, stdout.decode("utf-8")
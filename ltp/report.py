@@ -9,6 +9,26 @@ import json
 import logging
 from .session import LTPSession
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _results(obj, **fields) -> dict:
+    """
+    Return a report dictionary of a session, suite or test, made of the given
+    fields followed by the results counters of the object.
+    """
+    fields.update(
+        passed=obj.passed,
+        failed=obj.failed,
+        warnings=obj.warnings,
+        skipped=obj.skipped,
+        broken=obj.broken)
+
+    return fields
+
 
 def export_to_json(session: LTPSession, output: str) -> None:
     """
@@ -27,51 +47,26 @@ def export_to_json(session: LTPSession, output: str) -> None:
     logger = logging.getLogger("ltp.report")
     logger.info("Exporting JSON report into %s", output)
 
-    data = {}
-    data['session'] = {
-        "name": session.name,
-        "suites": [],
-        "passed": session.passed,
-        "failed": session.failed,
-        "warnings": session.warnings,
-        "skipped": session.skipped,
-        "broken": session.broken,
-    }
-
     suites = []
     for suite in session.suites:
         if not suite.completed:
             continue
 
-        suite_data = {
-            "name": suite.name,
-            "tests": [],
-            "passed": suite.passed,
-            "failed": suite.failed,
-            "warnings": suite.warnings,
-            "skipped": suite.skipped,
-            "broken": suite.broken,
-        }
-
-        for test in suite.tests:
-            if not test.completed:
-                continue
+        tests = [
+            _results(test, name=test.name, stdout=test.stdout)
+            for test in suite.tests if test.completed
+        ]
 
-            suite_data['tests'].append({
-                "name": test.name,
-                "stdout": test.stdout,
-                "passed": test.passed,
-                "failed": test.failed,
-                "warnings": test.warnings,
-                "skipped": test.skipped,
-                "broken": test.broken,
-            })
+        suites.append(_results(suite, name=suite.name, tests=tests))
 
-        suites.append(suite_data)
-
-    data['session']['suites'] = suites
+    data = {}
+    data['session'] = _results(session, name=session.name, suites=suites)
 
-    with open(output, "w+", encoding='UTF-8') as outfile:
-        json.dump(data, outfile, indent=4)
+    if orjson:
+        with open(output, "wb+") as outfile:
+            outfile.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output, "w+", encoding='UTF-8') as outfile:
+            json.dump(data, outfile, indent=2, ensure_ascii=False)
 
     logger.info("JSON report has been exported")
@@ -419,6 +419,7 @@ class LTPTest(LTPObject):
         self._name = data["name"]
         self._command = data["cmd"]
         self._args = data["args"]
+        self._cmd = f'{self._command} {" ".join(self._args)}'
         self._pass = 0
         self._fail = 0
         self._brok = 0
@@ -543,29 +544,29 @@ class LTPTest(LTPObject):
         # PATH must be set in order to run bash scripts
         env["PATH"] = f'{os.environ.get("PATH")}:{self._testcases_dir}'
 
-        cmd = f'{self._command} {" ".join(self._args)}'
+        self._logger.debug("start running command: '%s'", self._cmd)
 
-        self._logger.debug("start running command: '%s'", cmd)
-
-        # keep usage of preexec_fn trivial
-        # see warnings in https://docs.python.org/3/library/subprocess.html
-        # pylint: disable=subprocess-popen-preexec-fn
         with subprocess.Popen(
-                cmd,
+                self._cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 cwd=self._root_dir,
                 env=env,
                 shell=True,
                 universal_newlines=True,
-                preexec_fn=os.setsid) as proc:
+                errors="replace",
+                start_new_session=True) as proc:
+
+            info_enabled = self._logger.isEnabledFor(logging.INFO)
+            lines = []
+
+            for line in iter(proc.stdout.readline, ''):
+                if info_enabled:
+                    self._logger.info(line.rstrip())
 
-            for line in iter(proc.stdout.readline, b''):
-                if not line:
-                    break
+                lines.append(line)
 
-                self._logger.info(line.rstrip())
-                self._stdout += line
+            self._stdout = "".join(lines)
 
             proc.wait()
 
@@ -3,22 +3,23 @@ Generic tests configuration
 """
 import os
 import stat
+import shutil
 import pytest
 
 
-@pytest.fixture
-def prepare_tmpdir(tmpdir):
+@pytest.fixture(scope="session")
+def ltp_template(tmp_path_factory):
     """
-    Prepare the temporary directory with LTP folders and tests.
+    Create LTP folders and tests once per session.
     """
-    os.environ["LTPROOT"] = str(tmpdir)
-    os.environ["TMPDIR"] = str(tmpdir)
+    tmp_path = tmp_path_factory.mktemp("ltp")
 
     # create testcases folder
-    testcases = tmpdir.mkdir("testcases").mkdir("bin")
+    testcases = tmp_path / "testcases" / "bin"
+    testcases.mkdir(parents=True)
 
-    script_sh = testcases.join("script.sh")
-    script_sh.write(
+    script_sh = testcases / "script.sh"
+    script_sh.write_text(
         '#!/bin/bash\n'
         'echo ""\n'
         'echo ""\n'
@@ -30,32 +31,41 @@ def prepare_tmpdir(tmpdir):
         'echo "warnings $5"\n'
     )
 
-    st = os.stat(str(script_sh))
-    os.chmod(str(script_sh), st.st_mode | stat.S_IEXEC)
+    st = script_sh.stat()
+    script_sh.chmod(st.st_mode | stat.S_IEXEC)
 
     # create runtest folder
-    root = tmpdir.mkdir("runtest")
-
-    suitefile = root.join("dirsuite0")
-    suitefile.write("dir01 script.sh 1 0 0 0 0")
+    root = tmp_path / "runtest"
+    root.mkdir()
 
-    suitefile = root.join("dirsuite1")
-    suitefile.write("dir02 script.sh 0 1 0 0 0")
+    (root / "dirsuite0").write_text("dir01 script.sh 1 0 0 0 0")
+    (root / "dirsuite1").write_text("dir02 script.sh 0 1 0 0 0")
+    (root / "dirsuite2").write_text("dir03 script.sh 0 0 0 1 0")
+    (root / "dirsuite3").write_text("dir04 script.sh 0 0 1 0 0")
+    (root / "dirsuite4").write_text("dir05 script.sh 0 0 0 0 1")
 
-    suitefile = root.join("dirsuite2")
-    suitefile.write("dir03 script.sh 0 0 0 1 0")
+    # create scenario_groups folder
+    scenario_dir = tmp_path / "scenario_groups"
+    scenario_dir.mkdir()
 
-    suitefile = root.join("dirsuite3")
-    suitefile.write("dir04 script.sh 0 0 1 0 0")
+    (scenario_dir / "default").write_text("dirsuite0\ndirsuite1")
+    (scenario_dir / "network").write_text(
+        "dirsuite2\ndirsuite3\ndirsuite4\ndirsuite5")
 
-    suitefile = root.join("dirsuite4")
-    suitefile.write("dir05 script.sh 0 0 0 0 1")
+    return tmp_path
 
-    # create scenario_groups folder
-    scenario_dir = tmpdir.mkdir("scenario_groups")
 
-    scenario_def = scenario_dir.join("default")
-    scenario_def.write("dirsuite0\ndirsuite1")
+@pytest.fixture
+def prepare_tmpdir(tmp_path, ltp_template):
+    """
+    Prepare the temporary directory with LTP folders and tests.
+    """
+    os.environ["LTPROOT"] = str(tmp_path)
+    os.environ["TMPDIR"] = str(tmp_path)
 
-    scenario_def = scenario_dir.join("network")
-    scenario_def.write("dirsuite2\ndirsuite3\ndirsuite4\ndirsuite5")
+    # files are never modified by tests, so we can link them
+    for name in ["testcases", "runtest", "scenario_groups"]:
+        shutil.copytree(
+            str(ltp_template / name),
+            str(tmp_path / name),
+            copy_function=os.link)
@@ -3,31 +3,101 @@ Tests for install module
 """
 import os
 import shutil
+import subprocess
 import pytest
 import ltp.install
 from ltp.install import main as main_run
-from ltp.install import INSTALLERS
+from ltp.install import SUPPORTED_DISTROS
 
 
-SUPPORTED_DISTROS = [pm.distro_id for pm in INSTALLERS]
+LTP_REPO_URL = "https://github.com/linux-test-project/ltp.git"
 
 
-@pytest.mark.parametrize("distro", SUPPORTED_DISTROS)
-@pytest.mark.parametrize("build", ["--build", ""])
-@pytest.mark.parametrize("runtime", ["--runtime", ""])
-@pytest.mark.parametrize("m32", ["--m32", ""])
-@pytest.mark.parametrize("cmd", ["--cmd", ""])
-@pytest.mark.parametrize("tools", ["--tools", ""])
-def test_install_run(mocker, distro, build, runtime, m32, cmd, tools):
+@pytest.fixture(scope="session")
+def ltp_mirror(tmp_path_factory):
+    """
+    URL of a local bare LTP mirror, cloned once per session. Set
+    LTP_MIRROR_URL to use an already existing mirror instead.
+    """
+    url = os.environ.get("LTP_MIRROR_URL", None)
+    if url:
+        return url
+
+    # git is installed by the installer itself, so without git we let it
+    # clone from the upstream repository
+    if not shutil.which("git"):
+        return LTP_REPO_URL
+
+    mirror = str(tmp_path_factory.mktemp("ltp_mirror") / "ltp.git")
+    subprocess.run(
+        ["git", "clone", "--bare", "--depth=1", LTP_REPO_URL, mirror],
+        check=True)
+
+    return f"file://{mirror}"
+
+
+# every distro runs with two complementary sets of flags, and every pair of
+# flags is seen in all of its four on/off combinations
+INSTALL_RUN_ARGS = [
+    ("opensuse", []),
+    ("opensuse", ["--build", "--runtime", "--m32", "--cmd", "--tools"]),
+    ("sles", ["--runtime", "--cmd", "--tools"]),
+    ("sles", ["--build", "--m32"]),
+    ("debian", ["--build", "--m32", "--tools"]),
+    ("debian", ["--runtime", "--cmd"]),
+    ("ubuntu", ["--build", "--runtime", "--m32", "--cmd"]),
+    ("ubuntu", ["--tools"]),
+    ("alpine", ["--m32", "--cmd"]),
+    ("alpine", ["--build", "--runtime", "--tools"]),
+    ("fedora", ["--runtime", "--m32", "--tools"]),
+    ("fedora", ["--build", "--cmd"]),
+]
+
+
+def test_install_run_args():
+    """
+    Test that install_run arguments cover all the supported distros.
+    """
+    assert {distro for distro, _ in INSTALL_RUN_ARGS} == set(SUPPORTED_DISTROS)
+
+
+@pytest.mark.parametrize("distro, flags", INSTALL_RUN_ARGS)
+def test_install_run(capsys, distro, flags):
     """
     Test install_run function for __main__
     """
-    if distro == "debian" and not shutil.which("dpkg"):
+    # only Debian runtime packages depend on dpkg
+    if distro == "debian" and "--runtime" in flags and \
+            not shutil.which("dpkg"):
         pytest.xfail("Running system doesn't have dpkg")
 
-    mocker.patch("sys.argv", return_value=[
-                 '--distro', distro, build, runtime, m32, cmd, tools])
-    main_run()
+    main_run(['--distro', distro] + flags)
+    out = capsys.readouterr().out
+
+    if not {"--build", "--runtime", "--tools"} & set(flags):
+        assert out == "No packages selected!\n"
+        return
+
+    installer = ltp.install.get_installer(distro)
+    m32 = "--m32" in flags
+
+    pkgs = []
+    if "--build" in flags:
+        pkgs.extend(installer.get_build_pkgs(m32))
+        pkgs.extend(installer.get_libs_pkgs(m32))
+
+    if "--runtime" in flags:
+        pkgs.extend(installer.get_runtime_pkgs(m32))
+
+    if "--tools" in flags:
+        pkgs.extend(installer.get_tools_pkgs())
+
+    if "--cmd" in flags:
+        prefix = f"{installer.refresh_cmd} && {installer.install_cmd} "
+        assert out.startswith(prefix)
+        out = out[len(prefix):]
+
+    assert out.split() == pkgs
 
 
 @pytest.mark.skipif(os.geteuid() != 0, reason="this suite requires root")
@@ -37,40 +107,36 @@ class TestInstall:
     """
 
     @pytest.mark.parametrize("m32_support", [False, True])
-    def test_install_bad_args(self, m32_support, tmpdir):
+    @pytest.mark.parametrize("url, repo, inst", [
+        (None, "repo", "ltp_install"),
+        ("myrepo", None, "ltp_install"),
+        ("myrepo", "repo", None),
+    ])
+    def test_install_bad_args(self, m32_support, url, repo, inst, tmp_path):
         """
         Test install method with bad arguments.
         """
-        repo_dir = str(tmpdir / "repo")
-        inst_dir = str(tmpdir / "ltp_install")
+        repo_dir = str(tmp_path / repo) if repo else None
+        inst_dir = str(tmp_path / inst) if inst else None
         installer = ltp.install.get_installer()
 
         with pytest.raises(ValueError):
-            installer.install(m32_support, None, repo_dir, inst_dir)
-
-        with pytest.raises(ValueError):
-            installer.install(m32_support, "myrepo", None, inst_dir)
-
-        with pytest.raises(ValueError):
-            installer.install(m32_support, "myrepo", repo_dir, None)
+            installer.install(m32_support, url, repo_dir, inst_dir)
 
+    @pytest.mark.slow
     @pytest.mark.parametrize("m32_support", [False, True])
-    def test_install(self, m32_support, tmpdir):
+    def test_install(self, m32_support, tmp_path, ltp_mirror):
         """
         Test install method
         """
-        repo_dir = str(tmpdir / "repo")
-        inst_dir = str(tmpdir / "ltp_install")
+        repo_dir = str(tmp_path / "repo")
+        inst_dir = str(tmp_path / "ltp_install")
         installer = ltp.install.get_installer()
 
         if "alpine" in ltp.install.get_distro() and m32_support:
             pytest.skip("alpine doesn't support 32bit installation")
 
-        installer.install(
-            m32_support,
-            "https://github.com/linux-test-project/ltp.git",
-            repo_dir,
-            inst_dir)
+        installer.install(m32_support, ltp_mirror, repo_dir, inst_dir)
 
         assert os.path.isfile(inst_dir + "/runltp")
         assert os.path.isdir(inst_dir + "/runtest")
@@ -7,6 +7,14 @@ from ltp.session import LTPSession
 from ltp.report import export_to_json
 
 
+def load_report(path) -> dict:
+    """
+    Read a JSON report in one go and decode it with the stdlib parser, so
+    reports written by orjson are checked against it as well.
+    """
+    return json.loads(path.read_bytes())
+
+
 @pytest.fixture
 def stdout_msg():
     def _callback(passed, failed, broken, skipped, warnings):
@@ -22,20 +30,18 @@ def stdout_msg():
 
 
 @pytest.mark.usefixtures("prepare_tmpdir")
-def test_export_to_json_session_run(tmpdir, stdout_msg):
+def test_export_to_json_session_run(tmp_path, stdout_msg):
     """
     Test export_to_json function when running a session.
     """
-    reportfile = tmpdir.join("report.json")
+    reportfile = tmp_path / "report.json"
 
     session = LTPSession()
     session.run()
 
     export_to_json(session, str(reportfile))
 
-    data = None
-    with open(str(reportfile), "r") as report:
-        data = json.load(report)
+    data = load_report(reportfile)
 
     assert data["session"]["name"] is not None
     assert data["session"]["passed"] == 1
@@ -45,118 +51,49 @@ def test_export_to_json_session_run(tmpdir, stdout_msg):
     assert data["session"]["skipped"] == 1
 
     assert len(data["session"]["suites"]) == 5
-    assert {
-        "name": "dirsuite0",
-        "passed": 1,
-        "failed": 0,
-        "warnings": 0,
-        "broken": 0,
-        "skipped": 0,
-        "tests": [
-                {
-                    "name": "dir01",
-                    "passed": 1,
-                    "failed": 0,
-                    "warnings": 0,
-                    "broken": 0,
-                    "skipped": 0,
-                    "stdout": stdout_msg(1, 0, 0, 0, 0),
-                },
-        ]
-    } in data["session"]["suites"]
-    assert {
-        "name": "dirsuite1",
-        "passed": 0,
-        "failed": 1,
-        "warnings": 0,
-        "broken": 0,
-        "skipped": 0,
-        "tests": [
-                {
-                    "name": "dir02",
-                    "passed": 0,
-                    "failed": 1,
-                    "warnings": 0,
-                    "broken": 0,
-                    "skipped": 0,
-                    "stdout": stdout_msg(0, 1, 0, 0, 0),
-                },
-        ]
-    } in data["session"]["suites"]
-    assert {
-        "name": "dirsuite2",
-        "passed": 0,
-        "failed": 0,
-        "warnings": 0,
-        "broken": 0,
-        "skipped": 1,
-        "tests": [
-                {
-                    "name": "dir03",
-                    "passed": 0,
-                    "failed": 0,
-                    "warnings": 0,
-                    "broken": 0,
-                    "skipped": 1,
-                    "stdout": stdout_msg(0, 0, 0, 1, 0),
-                },
-        ]
-    } in data["session"]["suites"]
-    assert {
-        "name": "dirsuite3",
-        "passed": 0,
-        "failed": 0,
-        "warnings": 0,
-        "broken": 1,
-        "skipped": 0,
-        "tests": [
-                {
-                    "name": "dir04",
-                    "passed": 0,
-                    "failed": 0,
-                    "warnings": 0,
-                    "broken": 1,
-                    "skipped": 0,
-                    "stdout": stdout_msg(0, 0, 1, 0, 0),
-                },
-        ]
-    } in data["session"]["suites"]
-    assert {
-        "name": "dirsuite4",
-        "passed": 0,
-        "failed": 0,
-        "warnings": 1,
-        "broken": 0,
-        "skipped": 0,
-        "tests": [
+
+    by_name = {suite["name"]: suite for suite in data["session"]["suites"]}
+
+    # suite, test and passed/failed/broken/skipped/warnings counters
+    expected = [
+        ("dirsuite0", "dir01", (1, 0, 0, 0, 0)),
+        ("dirsuite1", "dir02", (0, 1, 0, 0, 0)),
+        ("dirsuite2", "dir03", (0, 0, 0, 1, 0)),
+        ("dirsuite3", "dir04", (0, 0, 1, 0, 0)),
+        ("dirsuite4", "dir05", (0, 0, 0, 0, 1)),
+    ]
+
+    for suite_name, test_name, counters in expected:
+        results = dict(zip(
+            ("passed", "failed", "broken", "skipped", "warnings"),
+            counters))
+
+        assert by_name[suite_name] == {
+            "name": suite_name,
+            **results,
+            "tests": [
                 {
-                    "name": "dir05",
-                    "passed": 0,
-                    "failed": 0,
-                    "warnings": 1,
-                    "broken": 0,
-                    "skipped": 0,
-                    "stdout": stdout_msg(0, 0, 0, 0, 1),
+                    "name": test_name,
+                    **results,
+                    "stdout": stdout_msg(*counters),
                 },
-        ]
-    } in data["session"]["suites"]
+            ]
+        }
 
 
 @pytest.mark.usefixtures("prepare_tmpdir")
-def test_export_to_json_session_run_scenario(tmpdir, stdout_msg):
+def test_export_to_json_session_run_scenario(tmp_path, stdout_msg):
     """
     Test export_to_json function when running a testing scenario.
     """
-    reportfile = tmpdir.join("report.json")
+    reportfile = tmp_path / "report.json"
 
     session = LTPSession()
     session.run_scenario("default")
 
     export_to_json(session, str(reportfile))
 
-    data = None
-    with open(str(reportfile), "r") as report:
-        data = json.load(report)
+    data = load_report(reportfile)
 
     assert data["session"]["name"] is not None
     assert data["session"]["passed"] == 1
@@ -207,20 +144,25 @@ def test_export_to_json_session_run_scenario(tmpdir, stdout_msg):
 
 
 @pytest.mark.usefixtures("prepare_tmpdir")
-def test_export_to_json_session_run_single(tmpdir, stdout_msg):
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_export_to_json_session_run_single(
+        tmp_path, stdout_msg, monkeypatch, use_orjson):
     """
     Test export_to_json function when running a testing scenario.
     """
-    reportfile = tmpdir.join("report.json")
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr("ltp.report.orjson", None)
+
+    reportfile = tmp_path / "report.json"
 
     session = LTPSession()
     session.run(suites=["dirsuite0"])
 
     export_to_json(session, str(reportfile))
 
-    data = None
-    with open(str(reportfile), "r") as report:
-        data = json.load(report)
+    data = load_report(reportfile)
 
     assert data["session"]["name"] is not None
     assert data["session"]["passed"] == 1
@@ -249,3 +191,24 @@ def test_export_to_json_session_run_single(tmpdir, stdout_msg):
             }
         ]
     } in data["session"]["suites"]
+
+
+@pytest.mark.usefixtures("prepare_tmpdir")
+def test_export_to_json_same_format(tmp_path, monkeypatch):
+    """
+    Test that export_to_json writes the same report with and without orjson.
+    """
+    pytest.importorskip("orjson")
+
+    session = LTPSession()
+    session.run(suites=["dirsuite0"])
+
+    fast_report = tmp_path / "orjson.json"
+    export_to_json(session, str(fast_report))
+
+    monkeypatch.setattr("ltp.report.orjson", None)
+
+    std_report = tmp_path / "json.json"
+    export_to_json(session, str(std_report))
+
+    assert fast_report.read_bytes() == std_report.read_bytes()
@@ -154,7 +154,34 @@ class TestLTPTest:
         assert ".." in msgs
         assert "testcases" in msgs
 
-    def test_run_ltproot(self, tmpdir, caplog):
+    def test_run_bad_encoding(self):
+        """
+        Test run method when test prints invalid UTF-8 characters.
+        """
+        test = LTPTest("dir01 printf '\\377'")
+        test.run()
+
+        assert test.completed
+        assert test.stdout == "\ufffd"
+
+    def test_run_crlf(self):
+        """
+        Test run method when test prints a summary with CRLF line endings.
+        """
+        test = LTPTest(
+            "dir01 printf 'Summary:\\r\\n"
+            "passed   0\\r\\n"
+            "failed   3\\r\\n"
+            "broken   0\\r\\n"
+            "skipped  0\\r\\n"
+            "warnings 0\\r\\n'")
+        test.run()
+
+        assert test.completed
+        assert test.passed == 0
+        assert test.failed == 3
+
+    def test_run_ltproot(self, tmp_path, caplog):
         """
         Test run method using LTPROOT from env vars.
         """
@@ -165,9 +192,9 @@ class TestLTPTest:
         assert test.completed
 
         msgs = [x.message for x in caplog.records]
-        assert str(tmpdir) in msgs
+        assert str(tmp_path) in msgs
 
-    def test_run_tmpdir(self, tmpdir, caplog):
+    def test_run_tmpdir(self, tmp_path, caplog):
         """
         Test run method using TMPDIR from env vars.
         """
@@ -178,7 +205,7 @@ class TestLTPTest:
         assert test.completed
 
         msgs = [x.message for x in caplog.records]
-        assert str(tmpdir) in msgs
+        assert str(tmp_path) in msgs
 
     def test_run_exception(self, caplog):
         """
@@ -238,13 +265,13 @@ class TestLTPSuite:
         with pytest.raises(ValueError):
             LTPSuite("this_path_doesnt_exist")
 
-    def test_constructor(self, tmpdir):
+    def test_constructor(self, tmp_path):
         """
         Test constructor.
         """
-        suitefile = tmpdir.join("dirsuite")
-        suitefile.write("dir01 ls -l\n\ndir02 ls -a")
-        suite = LTPSuite(suitefile)
+        suitefile = tmp_path / "dirsuite"
+        suitefile.write_text("dir01 ls -l\n\ndir02 ls -a")
+        suite = LTPSuite(str(suitefile))
 
         assert suite.name == "dirsuite"
         assert suite.tests[0].name == "dir01"
@@ -254,13 +281,13 @@ class TestLTPSuite:
         assert suite.tests[1].command == "ls"
         assert suite.tests[1].args == ["-a"]
 
-    def test_run(self, tmpdir):
+    def test_run(self, tmp_path):
         """
         Test run method.
         """
-        suitefile = tmpdir.join("dirsuite")
-        suitefile.write("dir01 ls -l\n\ndir02 ls -a")
-        suite = LTPSuite(suitefile)
+        suitefile = tmp_path / "dirsuite"
+        suitefile.write_text("dir01 ls -l\n\ndir02 ls -a")
+        suite = LTPSuite(str(suitefile))
         suite.run()
 
         assert suite.completed
@@ -1,10 +1,33 @@
 """
 Unittest for shell module.
 """
+import os
 import time
 import signal
-import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
 from ltp.backend import ShellBackend
+from ltp.backend import BackendError
+
+
+def _is_running(*args: str) -> bool:
+    """
+    True if a process with the given command line arguments is running.
+    """
+    cmdline = "\0".join(args).encode() + b"\0"
+
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as data:
+                if data.read() == cmdline:
+                    return True
+        except OSError:
+            pass
+
+    return False
 
 
 def test_name():
@@ -32,14 +55,14 @@ def test_run_cmd():
     assert ret["timeout"] == 1
 
 
-def test_run_cmd_cwd(tmpdir):
+def test_run_cmd_cwd(tmp_path):
     """
     Test run_cmd method using cwd initialization.
     """
-    tmpfile = tmpdir / "myfile"
-    tmpfile.write("")
+    tmpfile = tmp_path / "myfile"
+    tmpfile.write_text("")
 
-    ret = ShellBackend(cwd=str(tmpdir)).run_cmd("ls", 1)
+    ret = ShellBackend(cwd=str(tmp_path)).run_cmd("ls", 1)
     assert ret["command"] == "ls"
     assert ret["returncode"] == 0
     assert ret["stdout"] == "myfile\n"
@@ -57,31 +80,46 @@ def test_run_cmd_env():
     assert ret["timeout"] == 1
 
 
+def test_run_cmd_timeout():
+    """
+    Test run_cmd method when command times out. The shell has to fork
+    sleep, so the child must be killed together with the shell.
+    """
+    start_t = time.monotonic()
+
+    with pytest.raises(BackendError):
+        ShellBackend().run_cmd("sleep 10.1; true", 1)
+
+    assert time.monotonic() - start_t < 5
+    assert not _is_running("sleep", "10.1")
+
+
 def test_stop():
     """
     Test stop method.
     """
     shell = ShellBackend()
 
-    class MyThread(threading.Thread):
-        def __init__(self):
-            super(MyThread, self).__init__()
-            self.result = None
-            self.daemon = True
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(shell.run_cmd, "sleep 10.2; true", 20)
+
+        start_t = time.monotonic()
 
-        def run(self):
-            self.result = shell.run_cmd("sleep 10", 20)
+        # pylint: disable=protected-access
+        while not shell._process and not future.done():
+            assert time.monotonic() - start_t < 10
+            time.sleep(0)
 
-    thread = MyThread()
-    thread.start()
+        stop_t = time.monotonic()
+        shell.stop()
 
-    time.sleep(0.5)
-    shell.stop()
+        ret = future.result(timeout=30)
 
-    thread.join()
-    ret = thread.result
+        # the forked sleep keeps stdout open until it's killed as well
+        assert time.monotonic() - stop_t < 5
+        assert not _is_running("sleep", "10.2")
 
-    assert ret["command"] == "sleep 10"
+    assert ret["command"] == "sleep 10.2; true"
     assert ret["returncode"] == -signal.SIGTERM
     assert ret["stdout"] == ""
     assert ret["timeout"] == 20
@@ -93,25 +131,26 @@ def test_force_stop():
     """
     shell = ShellBackend()
 
-    class MyThread(threading.Thread):
-        def __init__(self):
-            super(MyThread, self).__init__()
-            self.result = None
-            self.daemon = True
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(shell.run_cmd, "sleep 10.3; true", 20)
+
+        start_t = time.monotonic()
 
-        def run(self):
-            self.result = shell.run_cmd("sleep 10", 20)
+        # pylint: disable=protected-access
+        while not shell._process and not future.done():
+            assert time.monotonic() - start_t < 10
+            time.sleep(0)
 
-    thread = MyThread()
-    thread.start()
+        stop_t = time.monotonic()
+        shell.force_stop()
 
-    time.sleep(0.5)
-    shell.force_stop()
+        ret = future.result(timeout=30)
 
-    thread.join()
-    ret = thread.result
+        # the forked sleep keeps stdout open until it's killed as well
+        assert time.monotonic() - stop_t < 5
+        assert not _is_running("sleep", "10.3")
 
-    assert ret["command"] == "sleep 10"
+    assert ret["command"] == "sleep 10.3; true"
     assert ret["returncode"] == -signal.SIGKILL
     assert ret["stdout"] == ""
     assert ret["timeout"] == 20
@@ -2,9 +2,9 @@
 Unittest for ssh module.
 """
 import os
+import pwd
 import time
 import socket
-import threading
 import subprocess
 import logging
 import pytest
@@ -12,6 +12,23 @@ from ltp.backend import SSHBackend
 from ltp.backend import BackendError
 
 
+def _free_port() -> int:
+    """
+    Return a TCP port which is currently free on the loopback interface.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+# pick a different port for each test process, so parallel runs don't clash
+SSH_PORT = _free_port()
+
+TESTS_DIR = os.path.abspath(os.path.dirname(__file__))
+
+USER = pwd.getpwuid(os.geteuid()).pw_name
+
+
 class OpenSSHServer:
     """
     Class helper used to initialize a OpenSSH server.
@@ -24,18 +41,16 @@ class OpenSSHServer:
         """
         self._logger = logging.getLogger("sshserver")
 
-        self._dir_name = os.path.dirname(__file__)
-        self._server_key = os.path.abspath(
-            os.path.sep.join([self._dir_name, 'id_rsa']))
-        self._sshd_config_tmpl = os.path.abspath(
-            os.path.sep.join([self._dir_name, 'sshd_config.tmpl']))
+        self._server_key = os.path.join(TESTS_DIR, 'id_rsa')
+        self._sshd_config_tmpl = os.path.join(TESTS_DIR, 'sshd_config.tmpl')
         self._sshd_config = os.path.abspath(
             os.path.sep.join([tmpdir, 'sshd_config']))
+        self._sshd_log = os.path.abspath(
+            os.path.sep.join([tmpdir, 'sshd.log']))
 
         self._port = port
         self._proc = None
-        self._thread = None
-        self._stop_thread = False
+        self._log_offset = 0
 
         # setup permissions on server key
         os.chmod(self._server_key, 0o600)
@@ -43,15 +58,6 @@ class OpenSSHServer:
         # create sshd configuration file
         self._create_sshd_config()
 
-    def _wait_for_port(self) -> None:
-        """
-        Wait until server is up.
-        """
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        while sock.connect_ex(('127.0.0.1', self._port)) != 0:
-            time.sleep(.1)
-        del sock
-
     def _create_sshd_config(self) -> None:
         """
         Create SSHD configuration file from template config expanding
@@ -64,17 +70,14 @@ class OpenSSHServer:
             tmpl = fh.read()
 
         # replace parent directory with the current directory
-        auth_file = os.path.join(os.path.abspath(
-            self._dir_name), 'authorized_keys')
+        auth_file = os.path.join(TESTS_DIR, 'authorized_keys')
         tmpl = tmpl.replace('{{authorized_keys}}', auth_file)
 
         self._logger.info("SSHD configuration is: %s", tmpl)
 
         # write sshd configuration file
         with open(self._sshd_config, 'w') as fh:
-            for line in tmpl:
-                fh.write(line)
-            fh.write(os.linesep)
+            fh.write(tmpl + os.linesep)
 
         self._logger.info(
             "'%s' configuration file has been created", self._sshd_config)
@@ -85,8 +88,9 @@ class OpenSSHServer:
         """
         cmd = [
             '/usr/sbin/sshd',
-            '-ddd',
             '-D',
+            '-E', self._sshd_log,
+            '-o', 'LogLevel=DEBUG3',
             '-p', str(self._port),
             '-h', self._server_key,
             '-f', self._sshd_config,
@@ -94,47 +98,103 @@ class OpenSSHServer:
 
         self._logger.info("starting SSHD with command: %s", cmd)
 
-        def run_server():
-            self._proc = subprocess.Popen(
-                " ".join(cmd),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                shell=True,
-                universal_newlines=True,
-            )
+        # sshd appends to its log file, so don't look at an old run
+        if os.path.isfile(self._sshd_log):
+            os.remove(self._sshd_log)
 
-            while self._proc.poll() is None:
-                if self._stop_thread:
-                    break
+        self._log_offset = 0
 
-                line = self._proc.stdout.readline()
-                if not line:
-                    break
+        # sshd writes its debug output into a log file, so nothing has to
+        # drain a pipe while tests are running
+        self._proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
 
-                self._logger.info(line.rstrip())
+        self._wait_for_listening()
 
-        self._thread = threading.Thread(target=run_server)
-        self._thread.start()
+        self._logger.info("service is up to use")
 
-        time.sleep(2)
+    def _wait_for_listening(self) -> None:
+        """
+        Wait until SSHD reports it's listening inside its log file.
+        """
+        start_t = time.monotonic()
 
-        self._logger.info("service is up to use")
+        def waiting() -> bool:
+            if self._proc.poll() is not None:
+                return False
+
+            if time.monotonic() - start_t >= 10:
+                return False
+
+            time.sleep(0.01)
+            return True
+
+        # sshd creates its log file once it's started
+        while not os.path.isfile(self._sshd_log):
+            if not waiting():
+                break
+        else:
+            with open(self._sshd_log, 'r', errors='replace') as fh:
+                pending = ""
+
+                while True:
+                    # keep reading from where we stopped, without the lines
+                    # which have been already checked
+                    pending += fh.read()
+                    if "Server listening on" in pending:
+                        return
+
+                    pending = pending[pending.rfind("\n") + 1:]
+
+                    if not waiting():
+                        break
+
+        # the fixture fails before yielding, so nobody else will stop it
+        self.stop()
+        self.log_new_lines()
+
+        raise RuntimeError("SSHD service didn't start in time")
 
     def stop(self) -> None:
         """
         Stop ssh server.
         """
-        if not self._proc or not self._thread:
+        if not self._proc:
             return
 
         self._logger.info("stopping SSHD service")
 
-        self._proc.kill()
-        self._stop_thread = True
-        self._thread.join(timeout=10)
+        self._proc.terminate()
+        try:
+            self._proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
 
         self._logger.info("service stopped")
 
+    def log_new_lines(self) -> None:
+        """
+        Forward the lines which have been written inside the SSHD log file
+        since the last call.
+        """
+        if not os.path.isfile(self._sshd_log):
+            return
+
+        with open(self._sshd_log, 'rb') as fh:
+            fh.seek(self._log_offset)
+            data = fh.read()
+
+        # an incomplete line is read again on the next call
+        end = data.rfind(b"\n") + 1
+        self._log_offset += end
+
+        for line in data[:end].decode("utf-8", errors="replace").splitlines():
+            self._logger.info(line)
+
 
 @pytest.fixture(scope="module")
 def config():
@@ -145,118 +205,70 @@ def config():
         """
         Configuration class
         """
-        import pwd
         hostname = "127.0.0.1"
-        port = 2222
-        testsdir = os.path.abspath(os.path.dirname(__file__))
+        port = SSH_PORT
+        testsdir = TESTS_DIR
         currdir = os.path.abspath('.')
-        user = pwd.getpwuid(os.geteuid()).pw_name
-        user_key = os.path.sep.join([testsdir, 'id_rsa'])
-        user_key_pub = os.path.sep.join([testsdir, 'id_rsa.pub'])
+        user = USER
+        user_key = os.path.join(TESTS_DIR, 'id_rsa')
+        user_key_pub = os.path.join(TESTS_DIR, 'id_rsa.pub')
 
     return Config()
 
 
-@pytest.fixture
-def ssh_server(tmpdir):
-    server = OpenSSHServer(str(tmpdir), port=2222)
-    server.start()
-    yield
-    server.stop()
-
-
-def test_name():
-    """
-    Test if name property returns the right name
-    """
-    client = SSHBackend()
-    assert client.name == "ssh"
-
-
-@pytest.mark.usefixtures("ssh_server")
-def test_bad_hostname(config):
-    """
-    Test connection when a bad hostname is given.
-    """
-    client = SSHBackend(
-        host="127.0.0.2",
-        port=config.port,
-        user=config.user,
-        key_file=config.user_key)
-
-    with pytest.raises(BackendError):
-        client.start()
-
-
-@pytest.mark.usefixtures("ssh_server")
-def test_bad_port(config):
+@pytest.fixture(scope="session")
+def sshd(tmp_path_factory):
     """
-    Test connection when a bad port is given.
+    SSHD service shared by the whole session.
     """
-    client = SSHBackend(
-        host=config.hostname,
-        port=12345,
-        user=config.user,
-        key_file=config.user_key)
-
-    with pytest.raises(BackendError):
-        client.start()
+    server = OpenSSHServer(
+        str(tmp_path_factory.mktemp("sshd")),
+        port=SSH_PORT)
+    server.start()
+    yield server
+    server.stop()
 
 
-@pytest.mark.usefixtures("ssh_server")
-def test_bad_user(config):
+@pytest.fixture
+def ssh_server(sshd):
     """
-    Test connection when a bad user is given.
+    SSHD service, logging what it did during the test at teardown, so it's
+    captured together with the test output.
     """
-    client = SSHBackend(
-        host=config.hostname,
-        port=config.port,
-        user="this_user_doesnt_exist",
-        key_file=config.user_key)
-
-    with pytest.raises(BackendError):
-        client.start()
+    yield sshd
+    sshd.log_new_lines()
 
 
-@pytest.mark.usefixtures("ssh_server")
-def test_bad_key_file(config):
+def test_name():
     """
-    Test connection when a bad key file is given.
+    Test if name property returns the right name
     """
-    client = SSHBackend(
-        host=config.hostname,
-        port=config.port,
-        user=config.user,
-        key_file="this_key_doesnt_exist.key")
-
-    with pytest.raises(BackendError):
-        client.start()
+    client = SSHBackend()
+    assert client.name == "ssh"
 
 
 @pytest.mark.usefixtures("ssh_server")
-def test_bad_password(config):
+@pytest.mark.parametrize("kwargs", [
+    dict(host="127.0.0.2"),
+    dict(port=12345),
+    dict(user="this_user_doesnt_exist"),
+    dict(key_file="this_key_doesnt_exist.key"),
+    dict(key_file=None, password="wrong_password"),
+    dict(key_file=None),
+], ids=["hostname", "port", "user", "key_file", "password", "auth"])
+def test_bad_args(config, kwargs):
     """
-    Test connection when a bad password is given.
+    Test connection when a bad argument or an unsupported authentication
+    method is given.
     """
-    client = SSHBackend(
+    args = dict(
         host=config.hostname,
         port=config.port,
         user=config.user,
-        password="wrong_password")
-
-    with pytest.raises(BackendError):
-        client.start()
-
+        key_file=config.user_key)
+    args.update(kwargs)
 
-@pytest.mark.usefixtures("ssh_server")
-def test_bad_auth(config):
-    """
-    Test a unsupported authentication method.
-    """
-    client = SSHBackend(
-        host=config.hostname,
-        port=config.port,
-        user=config.user)
+    client = SSHBackend(**args)
 
     with pytest.raises(BackendError):
         client.start()